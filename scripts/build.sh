@@ -158,6 +158,7 @@ build_python_analyzer_uv() {
     uv run pyinstaller --onefile \
                        --name audio-analyzer \
                        --clean \
+                       --exclude-module pyarrow \
                        --distpath assets/binaries \
                        src/bin/audio_analyzer.py
 
@@ -192,6 +193,7 @@ build_python_analyzer() {
         pyinstaller --onefile \
                     --name audio-analyzer \
                     --clean \
+                    --exclude-module pyarrow \
                     --distpath assets/binaries \
                     src/bin/audio_analyzer.py
 
@@ -16,7 +16,7 @@
 """
 
 import argparse
-import json
+import hashlib
 import logging
 import os
 import sys
@@ -24,7 +24,7 @@ import time
 import warnings
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 
 # PyInstaller兼容性修复
 if getattr(sys, "frozen", False):
@@ -50,35 +50,18 @@ try:
 except (ImportError, RuntimeError):
     pass
 
-# 数据处理库
+# 数据处理库：分析的每个步骤都依赖 pandas 与 numpy，缺失时无法运行
 try:
     import numpy as np
     import pandas as pd
+except ImportError as e:
+    print(f"错误: 需要安装 pandas 和 numpy ({e})", file=sys.stderr)
+    sys.exit(1)
 
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
-    print("警告: 未安装pandas和numpy，某些功能可能受限")
-
-    # 提供基本的替代实现
-    class pd:
-        @staticmethod
-        def read_json(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-
-    class np:
-        @staticmethod
-        def nan():
-            return float("nan")
-
-
+# 进度条为可选依赖，未安装tqdm时以文本输出进度
 try:
     from tqdm import tqdm
-
-    HAS_TQDM = True
 except ImportError:
-    HAS_TQDM = False
 
     class tqdm:
         def __init__(self, total=None, desc="", bar_format=None):
@@ -91,7 +74,7 @@ except ImportError:
             self.current += n
             if self.total:
                 progress = (self.current / self.total) * 100
-                print(f"{desc} 进度: {progress:.1f}%")
+                print(f"{self.desc} 进度: {progress:.1f}%")
 
         def set_postfix_str(self, s):
             print(f"  {s}")
@@ -103,12 +86,74 @@ except ImportError:
             print(f"{self.desc} 完成!")
 
 
+# 可选的Arrow支持：JSON Lines 列式解析、Parquet 缓存与CSV写出
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 可选的orjson：解析JSON数组输入（Rust端的默认输出）
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 写时复制：列选择等操作返回惰性副本，掩码赋值不再触发隐式的整块复制
+# （pandas 3.0 起为默认行为且该选项已弃用）
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 warnings.filterwarnings("ignore", category=pd.errors.PerformanceWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
+# 状态类别，列表下标即 Categorical 编码（0 为默认的 "质量良好"），
+# 各状态的编码常量按同一顺序定义，判定代码中不再按文本查找下标
+STATUS_CATEGORIES = [
+    "质量良好",
+    "数据不完整",
+    "可疑 (伪造)",
+    "疑似处理",
+    "已削波",
+    "严重压缩",
+    "低动态",
+]
+(
+    STATUS_GOOD,
+    STATUS_INCOMPLETE,
+    STATUS_FAKE,
+    STATUS_PROCESSED,
+    STATUS_CLIPPED,
+    STATUS_SEVERE_COMPRESSION,
+    STATUS_LOW_DYNAMIC,
+) = range(len(STATUS_CATEGORIES))
+
+# 备注依次由基础说明、削波说明与LRA说明以 " | " 拼接而成。
+# 基础说明按编码索引（0 为无），LRA说明为编码 1-3 对应的 (前缀, 后缀)，中间填入LRA数值
+BASE_NOTES = (
+    "",
+    "关键数据缺失，分析可能不准确。",
+    "频谱在约 18kHz 处存在硬性截止 (高度疑似伪造/升频)。",
+    "频谱在 18kHz 处能量较低，可能存在软性截止。",
+)
+LRA_NOTES = (
+    ("动态范围极低 (LRA: ", " LU)，严重过度压缩。"),
+    ("动态范围过低 (LRA: ", " LU)，可能过度压缩。"),
+    ("动态范围过高 (LRA: ", " LU)，可能需要压缩处理。"),
+)
+DEFAULT_NOTE = "未发现明显的硬性技术问题。"
+
+# 分析前各字段缺失值的填充值（峰值字段的填充值见 PeakConfig）
+FILL_VALUES = {"rmsDbAbove18k": 0.0, "rmsDbAbove16k": -90.0, "lra": 0.0}
+
 
 @dataclass
 class QualityThresholds:
@@ -144,359 +189,580 @@ class QualityThresholds:
     peak_medium_db: float = -3.0  # 中等峰值阈值 (dB)：此值以上需要注意
 
 
+@dataclass(frozen=True)
+class PeakConfig:
+    """
+    峰值字段的判定参数
+
+    输入可能提供 dB 峰值（peakAmplitudeDb）或线性峰值（peakAmplitude），
+    两者的填充值与各档阈值不同。分析入口按实际字段确定一次，
+    状态分析与评分直接使用其中的数值，不再逐处判断字段类型。
+    """
+
+    field: str  # 峰值字段名
+    fill_value: float  # 缺失值的填充值
+    clipping: float  # 削波状态判定阈值
+    good: float  # 评分：不高于此值为满分档
+    medium: float  # 评分：中等档上限
+    score_clipping: float  # 评分：有得分的峰值上限
+    clipping_note_suffix: str  # 削波备注的结尾
+
+    @classmethod
+    def for_field(cls, field: str, thresholds: QualityThresholds) -> "PeakConfig":
+        """按峰值字段构造判定参数"""
+        if field == "peakAmplitudeDb":
+            return cls(
+                field=field,
+                fill_value=-144.0,
+                clipping=thresholds.peak_clipping_db,
+                good=thresholds.peak_good_db,
+                medium=thresholds.peak_medium_db,
+                score_clipping=thresholds.peak_clipping_db,
+                clipping_note_suffix=" (峰值接近0dB)。",
+            )
+        return cls(
+            field=field,
+            fill_value=0.0,
+            clipping=thresholds.peak_clipping_linear,
+            good=0.5,
+            medium=0.8,
+            score_clipping=0.999,
+            clipping_note_suffix="。",
+        )
+
+
+@dataclass(frozen=True)
+class AnalysisInputs:
+    """
+    一次分析所用的列数据
+
+    各列在分析入口处只转换与填充一次，状态分析与评分共用同一组数组，
+    不再各自扫描 DataFrame 的列。字典均以字段名为键，只包含实际存在的字段。
+    未填充的原始数组与缺失掩码只用于推导以下各项，不随结果保留。
+    """
+
+    cols: FrozenSet[str]  # 输入的列集合
+    peak_cfg: Optional[PeakConfig]  # 峰值字段的判定参数，无峰值字段时为None
+    filled: Dict[str, np.ndarray]  # 按 FILL_VALUES / 峰值配置填充缺失值后的数组
+    missing_counts: np.ndarray  # 每行缺失的关键字段数（不存在的字段计为缺失）
+    valid_masks: Dict[str, np.ndarray]  # 参与判定与评分的有效掩码
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    """
+    取列的 float64 数组（缺失值为NaN）
+
+    float64 列的缺失值本身即为NaN，直接返回其底层数组；指定 na_value 的 to_numpy
+    总会复制整列并额外扫描一遍缺失值，只对其他类型（整数、可空、object 等）使用。
+    """
+    if series.dtype == np.float64:
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _fill_nan(values: np.ndarray, fill_value: float) -> np.ndarray:
+    """返回将NaN替换为填充值的新数组"""
+    return np.where(np.isnan(values), fill_value, values)
+
+
+def _map_band(
+    values: np.ndarray, in_min: float, in_max: float, out_min: float, out_max: float
+) -> np.ndarray:
+    """
+    将 [in_min, in_max] 线性映射到 [out_min, out_max]，不截断
+
+    用于 np.select 的各档取值时，档位条件已限定取值落在区间内，其余行的结果会被
+    丢弃；需要截断的调用方先 np.clip 再传入。输入区间退化为一点时全部返回 out_min。
+    """
+    if in_max == in_min:
+        return np.full(values.size, out_min, dtype=np.float64)
+    out = values - in_min
+    out *= out_max - out_min
+    out /= in_max - in_min
+    out += out_min
+    return out
+
+
+def _format_lra(values: np.ndarray) -> np.ndarray:
+    """批量格式化LRA数值，输出与 f"{lra:.1f}" 一致"""
+    return np.char.mod("%.1f", values).astype(object)
+
+
 class AudioQualityAnalyzer:
     """高性能音频质量分析器（PyInstaller兼容版 - 保持原始评分算法）"""
 
+    # 判定状态所依赖的关键字段，一个都不存在时所有行均为 "数据不完整"
+    CRITICAL_FIELDS = frozenset(
+        ["rmsDbAbove18k", "lra", "peakAmplitudeDb", "peakAmplitude"]
+    )
+
     def __init__(self):
         self.thresholds = QualityThresholds()
         self.stats = {"total_files": 0, "processed_files": 0, "processing_time": 0.0}
 
-    def _safe_fillna(self, series, value=0):
-        """安全的fillna操作"""
-        try:
-            return series.fillna(value)
-        except Exception:
-            return series.replace([np.nan, None], value)
-
-    def _map_to_score_vectorized(
+    def _compose_notes(
         self,
-        values: pd.Series,
-        in_min: float,
-        in_max: float,
-        out_min: float = 0,
-        out_max: float = 1,
-    ) -> pd.Series:
-        """原始的分数映射函数 - 保持不变"""
-        values = self._safe_fillna(values, 0)
-        values = np.clip(values, in_min, in_max)
-        if in_max == in_min:
-            return pd.Series([out_min] * len(values))
-        return out_min + (values - in_min) * (out_max - out_min) / (in_max - in_min)
-
-    def _analyze_row_vectorized(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
-        """原始的状态分析函数 - 保持完全不变"""
-        status_series = pd.Series(["质量良好"] * len(df))
-        notes_series = pd.Series([""] * len(df))
+        base_codes: np.ndarray,
+        clip_flags: np.ndarray,
+        lra_codes: np.ndarray,
+        lra_values: Optional[np.ndarray],
+        clipping_note: str,
+    ) -> np.ndarray:
+        """
+        由各部分的编码一次性生成备注文本
+
+        基础说明与削波说明只有 8 种组合，先生成组合表再按下标取值；
+        只有带LRA说明的行需要逐行格式化数值。
+        """
+        prefixes = [
+            " | ".join(part for part in (base, clip) if part)
+            for base in BASE_NOTES
+            for clip in ("", clipping_note)
+        ]
+        prefix_codes = base_codes * 2 + clip_flags
 
+        notes = np.array([p or DEFAULT_NOTE for p in prefixes], dtype=object)[
+            prefix_codes
+        ]
+        if lra_values is not None:
+            joined = np.array([p + " | " if p else "" for p in prefixes], dtype=object)
+            for code, (head, tail) in enumerate(LRA_NOTES, start=1):
+                mask = lra_codes == code
+                notes[mask] = (
+                    joined[prefix_codes[mask]]
+                    + head
+                    + _format_lra(lra_values[mask])
+                    + tail
+                )
+        return notes
+
+    def _resolve_columns(
+        self, df: pd.DataFrame
+    ) -> Tuple[FrozenSet[str], Optional[PeakConfig]]:
+        """一次性解析列集合与峰值配置（优先dB），供各分析步骤共用"""
+        cols = frozenset(df.columns)
+        peak_field = self._resolve_peak_field(cols)
+        if peak_field is None:
+            return cols, None
+        return cols, PeakConfig.for_field(peak_field, self.thresholds)
+
+    @staticmethod
+    def _resolve_peak_field(cols: FrozenSet[str]) -> Optional[str]:
+        """选择峰值字段：优先 peakAmplitudeDb，其次 peakAmplitude"""
+        if "peakAmplitudeDb" in cols:
+            return "peakAmplitudeDb"
+        if "peakAmplitude" in cols:
+            return "peakAmplitude"
+        return None
+
+    def _extract_arrays(
+        self,
+        df: pd.DataFrame,
+        cols: FrozenSet[str],
+        peak_cfg: Optional[PeakConfig],
+    ) -> Dict[str, np.ndarray]:
+        """将参与分析的列一次性转换为 float64 数组（缺失值为NaN），供各分析步骤共用"""
+        fields = ["rmsDbAbove18k", "rmsDbAbove16k", "lra"]
+        if peak_cfg:
+            fields.append(peak_cfg.field)
+        return {field: _column_values(df[field]) for field in fields if field in cols}
+
+    def _compute_missing_masks(
+        self, arrays: Dict[str, np.ndarray], peak_cfg: Optional[PeakConfig]
+    ) -> Dict[str, np.ndarray]:
+        """计算各关键字段的缺失掩码（NaN或0.0视为缺失），供状态分析与评分共用"""
         critical_fields = ["rmsDbAbove18k", "lra"]
-        peak_field = None
-        if "peakAmplitudeDb" in df.columns:
-            peak_field = "peakAmplitudeDb"
-            critical_fields.append("peakAmplitudeDb")
-        elif "peakAmplitude" in df.columns:
-            peak_field = "peakAmplitude"
-            critical_fields.append("peakAmplitude")
+        if peak_cfg:
+            critical_fields.append(peak_cfg.field)
 
-        missing_counts = pd.Series([0] * len(df))
-        missing_fields_list = []
+        return {
+            field: np.isnan(arrays[field]) | (arrays[field] == 0.0)
+            for field in critical_fields
+            if field in arrays
+        }
 
+    def _count_missing(
+        self,
+        n: int,
+        missing_masks: Dict[str, np.ndarray],
+        peak_cfg: Optional[PeakConfig],
+    ) -> np.ndarray:
+        """
+        统计每行缺失的关键字段数，供状态判定（数据不完整）与完整性扣分共用
+
+        不存在的关键字段对所有行计为缺失。
+        """
+        critical_fields = ["rmsDbAbove18k", "lra"]
+        if peak_cfg:
+            critical_fields.append(peak_cfg.field)
+
+        missing_counts = np.zeros(n, dtype=np.int32)
         for field in critical_fields:
-            if field in df.columns:
-                field_missing = df[field].isna() | (df[field] == 0.0)
-                missing_counts += field_missing.astype(int)
-                for idx in df[field_missing].index:
-                    if idx not in missing_fields_list:
-                        missing_fields_list.append(idx)
+            if field in missing_masks:
+                missing_counts += missing_masks[field]
             else:
                 missing_counts += 1
+        return missing_counts
 
-        incomplete_mask = missing_counts >= 2
-        status_series.loc[incomplete_mask] = "数据不完整"
-        notes_series.loc[incomplete_mask] = "关键数据缺失，分析可能不准确。"
-
-        if "rmsDbAbove18k" in df.columns:
-            rms_18k = self._safe_fillna(df["rmsDbAbove18k"], 0)
+    def _compute_valid_masks(
+        self,
+        arrays: Dict[str, np.ndarray],
+        missing_masks: Dict[str, np.ndarray],
+        peak_cfg: Optional[PeakConfig],
+    ) -> Dict[str, np.ndarray]:
+        """
+        计算各字段参与判定与评分的有效掩码，供状态分析与评分共用
+
+        18kHz 频谱非缺失且非0、LRA 大于0、峰值非缺失时有效。
+        """
+        valid_masks = {}
+        if "rmsDbAbove18k" in arrays:
+            valid_masks["rmsDbAbove18k"] = ~missing_masks["rmsDbAbove18k"]
+        if "lra" in arrays:
+            # NaN 与任何数比较均为 False，与先填充为0再判断 > 0 的结果相同
+            valid_masks["lra"] = arrays["lra"] > 0
+        if peak_cfg:
+            valid_masks[peak_cfg.field] = ~np.isnan(arrays[peak_cfg.field])
+        return valid_masks
+
+    def _fill_arrays(
+        self, arrays: Dict[str, np.ndarray], peak_cfg: Optional[PeakConfig]
+    ) -> Dict[str, np.ndarray]:
+        """按各字段的填充值替换NaN，供状态分析与评分共用"""
+        fill_values = dict(FILL_VALUES)
+        if peak_cfg:
+            fill_values[peak_cfg.field] = peak_cfg.fill_value
+        return {
+            field: _fill_nan(values, fill_values[field])
+            for field, values in arrays.items()
+        }
+
+    def _prepare_inputs(
+        self,
+        df: pd.DataFrame,
+        cols: Optional[FrozenSet[str]] = None,
+        peak_cfg: Optional[PeakConfig] = None,
+    ) -> AnalysisInputs:
+        """提取、填充参与分析的列并计算各掩码，每次分析只执行一次"""
+        if cols is None:
+            cols, peak_cfg = self._resolve_columns(df)
+        arrays = self._extract_arrays(df, cols, peak_cfg)
+        missing_masks = self._compute_missing_masks(arrays, peak_cfg)
+        return AnalysisInputs(
+            cols=cols,
+            peak_cfg=peak_cfg,
+            filled=self._fill_arrays(arrays, peak_cfg),
+            missing_counts=self._count_missing(len(df), missing_masks, peak_cfg),
+            valid_masks=self._compute_valid_masks(arrays, missing_masks, peak_cfg),
+        )
 
-            fake_mask = (rms_18k < self.thresholds.spectrum_fake_threshold) & (
-                ~incomplete_mask
-            )
-            status_series.loc[fake_mask] = "可疑 (伪造)"
-            notes_series.loc[fake_mask] = (
-                "频谱在约 18kHz 处存在硬性截止 (高度疑似伪造/升频)。"
-            )
+    def _analyze_row_vectorized(
+        self, df: pd.DataFrame, inputs: Optional[AnalysisInputs] = None
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        判定每行的状态并生成备注
+
+        依次按 数据不完整、伪造/疑似处理、削波、严重压缩/低动态 的规则写入 int8 状态码，
+        各规则用累积的掩码排除已判为不完整、可疑等状态的行；备注各部分同时记为编码，
+        最后由 _compose_notes 一次性生成文本。返回 (分类状态列, 备注列)。
+        """
+        if inputs is None:
+            inputs = self._prepare_inputs(df)
+        cols, peak_cfg = inputs.cols, inputs.peak_cfg
+        valid_masks = inputs.valid_masks
+        t = self.thresholds
+
+        n = len(df)
+        status_codes = np.full(n, STATUS_GOOD, dtype=np.int8)
+        # 备注各部分的编码，见 BASE_NOTES / LRA_NOTES
+        base_codes = np.zeros(n, dtype=np.int8)
+        clip_flags = np.zeros(n, dtype=np.int8)
+        lra_codes = np.zeros(n, dtype=np.int8)
+        lra_values = None
+        clipping_note = ""
+
+        incomplete_mask = inputs.missing_counts >= 2
+        status_codes[incomplete_mask] = STATUS_INCOMPLETE
+        base_codes[incomplete_mask] = 1
+
+        # 按判定顺序累积的状态掩码，代替对状态文本的重复正则扫描：
+        # suspect_mask 对应 "可疑"，flagged_mask 对应 "可疑|严重压缩|已削波|低动态"
+        suspect_mask = np.zeros(n, dtype=bool)
+        flagged_mask = np.zeros(n, dtype=bool)
+
+        if "rmsDbAbove18k" in cols:
+            rms_18k = inputs.filled["rmsDbAbove18k"]
+
+            fake_mask = (rms_18k < t.spectrum_fake_threshold) & (~incomplete_mask)
+            status_codes[fake_mask] = STATUS_FAKE
+            base_codes[fake_mask] = 2
+            suspect_mask = fake_mask
+            flagged_mask = suspect_mask.copy()
 
             processed_mask = (
-                (rms_18k < self.thresholds.spectrum_processed_threshold)
-                & (rms_18k >= self.thresholds.spectrum_fake_threshold)
+                (rms_18k < t.spectrum_processed_threshold)
+                & (rms_18k >= t.spectrum_fake_threshold)
                 & (~incomplete_mask)
                 & (~fake_mask)
             )
-            status_series.loc[processed_mask] = "疑似处理"
-            notes_series.loc[processed_mask] = (
-                "频谱在 18kHz 处能量较低，可能存在软性截止。"
-            )
-
-        if peak_field and peak_field in df.columns:
-            peak_values = self._safe_fillna(
-                df[peak_field], -144.0 if peak_field == "peakAmplitudeDb" else 0.0
-            )
+            status_codes[processed_mask] = STATUS_PROCESSED
+            base_codes[processed_mask] = 3
 
-            if peak_field == "peakAmplitudeDb":
-                clipping_mask = (
-                    (peak_values >= self.thresholds.peak_clipping_db)
-                    & (~incomplete_mask)
-                    & (~status_series.str.contains("可疑", na=False))
-                )
-            else:
-                clipping_mask = (
-                    (peak_values >= self.thresholds.peak_clipping_linear)
-                    & (~incomplete_mask)
-                    & (~status_series.str.contains("可疑", na=False))
-                )
+        if peak_cfg:
+            peak_values = inputs.filled[peak_cfg.field]
 
-            status_series.loc[clipping_mask] = "已削波"
-            notes_series.loc[clipping_mask] = np.where(
-                notes_series.loc[clipping_mask] != "",
-                notes_series.loc[clipping_mask] + " | 存在严重数字削波风险",
-                "存在严重数字削波风险",
+            clipping_mask = (
+                (peak_values >= peak_cfg.clipping)
+                & (~incomplete_mask)
+                & (~suspect_mask)
             )
 
-            if peak_field == "peakAmplitudeDb":
-                notes_series.loc[clipping_mask] += " (峰值接近0dB)。"
-            else:
-                notes_series.loc[clipping_mask] += "。"
+            status_codes[clipping_mask] = STATUS_CLIPPED
+            flagged_mask |= clipping_mask
+            clip_flags[clipping_mask] = 1
+            clipping_note = "存在严重数字削波风险" + peak_cfg.clipping_note_suffix
 
-        if "lra" in df.columns:
-            lra_values = self._safe_fillna(df["lra"], 0)
-            lra_valid = (lra_values > 0) & (~incomplete_mask)
+        if "lra" in cols:
+            lra_values = inputs.filled["lra"]
+            lra_valid = valid_masks["lra"] & (~incomplete_mask)
 
             severe_compression_mask = (
-                (lra_values < self.thresholds.lra_poor_max)
-                & lra_valid
-                & (~status_series.str.contains("可疑", na=False))
+                (lra_values < t.lra_poor_max) & lra_valid & (~suspect_mask)
             )
-            status_series.loc[severe_compression_mask] = "严重压缩"
-            for idx in df[severe_compression_mask].index:
-                lra_val = df.loc[idx, "lra"]
-                note = f"动态范围极低 (LRA: {lra_val:.1f} LU)，严重过度压缩。"
-                if notes_series.loc[idx] != "":
-                    notes_series.loc[idx] += f" | {note}"
-                else:
-                    notes_series.loc[idx] = note
+            status_codes[severe_compression_mask] = STATUS_SEVERE_COMPRESSION
+            flagged_mask |= severe_compression_mask
+            lra_codes[severe_compression_mask] = 1
 
             low_dynamic_mask = (
-                (lra_values >= self.thresholds.lra_poor_max)
-                & (lra_values < self.thresholds.lra_low_max)
-                & lra_valid
-                & (~status_series.str.contains("可疑|严重压缩|已削波", na=False))
-            )
-            status_series.loc[low_dynamic_mask] = "低动态"
-            for idx in df[low_dynamic_mask].index:
-                lra_val = df.loc[idx, "lra"]
-                note = f"动态范围过低 (LRA: {lra_val:.1f} LU)，可能过度压缩。"
-                if notes_series.loc[idx] != "":
-                    notes_series.loc[idx] += f" | {note}"
-                else:
-                    notes_series.loc[idx] = note
-
-            too_high_mask = (
-                (lra_values > self.thresholds.lra_too_high)
+                (lra_values >= t.lra_poor_max)
+                & (lra_values < t.lra_low_max)
                 & lra_valid
-                & (~status_series.str.contains("可疑|严重压缩|已削波|低动态", na=False))
+                & (~flagged_mask)
             )
-            for idx in df[too_high_mask].index:
-                lra_val = df.loc[idx, "lra"]
-                note = f"动态范围过高 (LRA: {lra_val:.1f} LU)，可能需要压缩处理。"
-                if notes_series.loc[idx] != "":
-                    notes_series.loc[idx] += f" | {note}"
-                else:
-                    notes_series.loc[idx] = note
-
-        default_mask = notes_series == ""
-        notes_series.loc[default_mask] = "未发现明显的硬性技术问题。"
-
-        return status_series, notes_series
+            status_codes[low_dynamic_mask] = STATUS_LOW_DYNAMIC
+            flagged_mask |= low_dynamic_mask
+            lra_codes[low_dynamic_mask] = 2
 
-    def _calculate_quality_score_vectorized(self, df: pd.DataFrame) -> pd.Series:
-        """原始的质量评分函数 - 完全恢复原算法"""
-        MAX_SCORE_INTEGRITY, MAX_SCORE_DYNAMICS, MAX_SCORE_SPECTRUM = 40, 30, 30
+            too_high_mask = (lra_values > t.lra_too_high) & lra_valid & (~flagged_mask)
+            lra_codes[too_high_mask] = 3
 
-        integrity_scores = pd.Series([0.0] * len(df))
-        dynamics_scores = pd.Series([0.0] * len(df))
-        spectrum_scores = pd.Series([0.0] * len(df))
+        notes_values = self._compose_notes(
+            base_codes, clip_flags, lra_codes, lra_values, clipping_note
+        )
 
-        critical_fields = ["rmsDbAbove18k", "lra"]
-        peak_field = None
-        if "peakAmplitudeDb" in df.columns:
-            peak_field = "peakAmplitudeDb"
-            critical_fields.append("peakAmplitudeDb")
-        elif "peakAmplitude" in df.columns:
-            peak_field = "peakAmplitude"
-            critical_fields.append("peakAmplitude")
-
-        completeness_penalty = pd.Series([0] * len(df))
-        for field in critical_fields:
-            if field in df.columns:
-                completeness_penalty += (df[field].isna() | (df[field] == 0.0)).astype(
-                    int
-                ) * 10
-            else:
-                completeness_penalty += 10
+        return (
+            pd.Series(
+                pd.Categorical.from_codes(status_codes, STATUS_CATEGORIES),
+                index=df.index,
+            ),
+            pd.Series(notes_values, index=df.index, copy=False),
+        )
 
-        if "rmsDbAbove18k" in df.columns:
-            rms_18k = self._safe_fillna(df["rmsDbAbove18k"], 0)
-            valid_rms = rms_18k != 0
+    @staticmethod
+    def _status_codes(df: pd.DataFrame) -> np.ndarray:
+        """
+        取 "状态" 列的类别编码，评分的上限判定按整数比较
 
-            excellent_mask = (
-                rms_18k >= self.thresholds.spectrum_good_threshold
-            ) & valid_rms
-            integrity_scores.loc[excellent_mask] += 25
+        分析得到的状态列已按 STATUS_CATEGORIES 编码，此时直接沿用其编码；
+        未知的状态文本或缺少状态列时编码为 -1，不触发任何上限。
+        """
+        if "状态" not in df.columns:
+            return np.full(len(df), -1, dtype=np.int8)
+        return pd.Categorical(df["状态"], categories=STATUS_CATEGORIES).codes
 
+    def _calculate_quality_score_vectorized(
+        self, df: pd.DataFrame, inputs: Optional[AnalysisInputs] = None
+    ) -> pd.Series:
+        """
+        计算每行的综合质量分
+
+        完整性（18kHz 频谱 0-25 分 + 峰值 0-15 分）与动态（LRA 0-30 分）按 QualityThresholds
+        与 PeakConfig 的档位由 np.select 取值，档内线性映射；频谱得分为 16kHz 能量截断到
+        [-90, -55] dB 后映射的 0-30 分。每缺失一个关键字段扣10分；再按状态列的编码，
+        可疑 (伪造) 的行最高 20 分、数据不完整的行最高 40 分，结果取整且不低于 0。
+        inputs 为与状态分析共用的 _prepare_inputs 结果，未传入时在此提取。
+        """
+        if inputs is None:
+            inputs = self._prepare_inputs(df)
+        cols, peak_cfg = inputs.cols, inputs.peak_cfg
+        valid_masks = inputs.valid_masks
+        t = self.thresholds
+
+        # 每缺失一个关键字段扣10分
+        completeness_penalty = inputs.missing_counts * 10
+
+        status_codes = self._status_codes(df)
+
+        n = len(df)
+        integrity_scores = np.zeros(n, dtype=np.float64)
+        dynamics_scores = np.zeros(n, dtype=np.float64)
+        spectrum_scores = np.zeros(n, dtype=np.float64)
+
+        if "rmsDbAbove18k" in cols:
+            rms_18k = inputs.filled["rmsDbAbove18k"]
+            valid_rms = valid_masks["rmsDbAbove18k"]
+
+            excellent_mask = (rms_18k >= t.spectrum_good_threshold) & valid_rms
             good_mask = (
-                (rms_18k >= self.thresholds.spectrum_processed_threshold)
-                & (rms_18k < self.thresholds.spectrum_good_threshold)
+                (rms_18k >= t.spectrum_processed_threshold)
+                & (rms_18k < t.spectrum_good_threshold)
                 & valid_rms
             )
-            integrity_scores.loc[good_mask] += self._map_to_score_vectorized(
-                rms_18k.loc[good_mask],
-                self.thresholds.spectrum_processed_threshold,
-                self.thresholds.spectrum_good_threshold,
-                15,
-                25,
-            )
-
             medium_mask = (
-                (rms_18k >= self.thresholds.spectrum_fake_threshold)
-                & (rms_18k < self.thresholds.spectrum_processed_threshold)
+                (rms_18k >= t.spectrum_fake_threshold)
+                & (rms_18k < t.spectrum_processed_threshold)
                 & valid_rms
             )
-            integrity_scores.loc[medium_mask] += self._map_to_score_vectorized(
-                rms_18k.loc[medium_mask],
-                self.thresholds.spectrum_fake_threshold,
-                self.thresholds.spectrum_processed_threshold,
-                5,
-                15,
+            # 各档位互斥，np.select 一次写入即可代替逐档的掩码累加；
+            # 各档的取值只在本档范围内被选中，因此用不截断的 _map_band
+            integrity_scores += np.select(
+                [excellent_mask, good_mask, medium_mask],
+                [
+                    25.0,
+                    _map_band(
+                        rms_18k,
+                        t.spectrum_processed_threshold,
+                        t.spectrum_good_threshold,
+                        15,
+                        25,
+                    ),
+                    _map_band(
+                        rms_18k,
+                        t.spectrum_fake_threshold,
+                        t.spectrum_processed_threshold,
+                        5,
+                        15,
+                    ),
+                ],
+                default=0.0,
             )
 
-        if peak_field and peak_field in df.columns:
-            peak_values = self._safe_fillna(
-                df[peak_field], -144.0 if peak_field == "peakAmplitudeDb" else 0.0
-            )
-            valid_peak = ~df[peak_field].isna()
-
-            if peak_field == "peakAmplitudeDb":
-                excellent_mask = (
-                    peak_values <= self.thresholds.peak_good_db
-                ) & valid_peak
-                integrity_scores.loc[excellent_mask] += 15
-
-                good_mask = (
-                    (peak_values > self.thresholds.peak_good_db)
-                    & (peak_values <= self.thresholds.peak_medium_db)
-                    & valid_peak
-                )
-                integrity_scores.loc[good_mask] += self._map_to_score_vectorized(
-                    peak_values.loc[good_mask],
-                    self.thresholds.peak_good_db,
-                    self.thresholds.peak_medium_db,
-                    15,
-                    10,
-                )
+        if peak_cfg:
+            peak_values = inputs.filled[peak_cfg.field]
+            valid_peak = valid_masks[peak_cfg.field]
 
-                medium_mask = (
-                    (peak_values > self.thresholds.peak_medium_db)
-                    & (peak_values <= self.thresholds.peak_clipping_db)
-                    & valid_peak
-                )
-                integrity_scores.loc[medium_mask] += self._map_to_score_vectorized(
-                    peak_values.loc[medium_mask],
-                    self.thresholds.peak_medium_db,
-                    self.thresholds.peak_clipping_db,
-                    10,
-                    3,
-                )
-            else:
-                excellent_mask = (peak_values <= 0.5) & valid_peak
-                integrity_scores.loc[excellent_mask] += 15
-
-                good_mask = (peak_values > 0.5) & (peak_values <= 0.8) & valid_peak
-                integrity_scores.loc[good_mask] += self._map_to_score_vectorized(
-                    peak_values.loc[good_mask], 0.5, 0.8, 15, 10
-                )
+            peak_good = peak_cfg.good
+            peak_medium = peak_cfg.medium
+            peak_clipping = peak_cfg.score_clipping
 
-                medium_mask = (peak_values > 0.8) & (peak_values <= 0.999) & valid_peak
-                integrity_scores.loc[medium_mask] += self._map_to_score_vectorized(
-                    peak_values.loc[medium_mask], 0.8, 0.999, 10, 3
-                )
+            excellent_mask = (peak_values <= peak_good) & valid_peak
+            good_mask = (
+                (peak_values > peak_good) & (peak_values <= peak_medium) & valid_peak
+            )
+            medium_mask = (
+                (peak_values > peak_medium)
+                & (peak_values <= peak_clipping)
+                & valid_peak
+            )
+            integrity_scores += np.select(
+                [excellent_mask, good_mask, medium_mask],
+                [
+                    15.0,
+                    _map_band(peak_values, peak_good, peak_medium, 15, 10),
+                    _map_band(peak_values, peak_medium, peak_clipping, 10, 3),
+                ],
+                default=0.0,
+            )
 
-        if "lra" in df.columns:
-            lra_values = self._safe_fillna(df["lra"], 0)
-            valid_lra = lra_values > 0
+        if "lra" in cols:
+            lra_values = inputs.filled["lra"]
+            valid_lra = valid_masks["lra"]
 
             ideal_mask = (
-                (lra_values >= self.thresholds.lra_excellent_min)
-                & (lra_values <= self.thresholds.lra_excellent_max)
+                (lra_values >= t.lra_excellent_min)
+                & (lra_values <= t.lra_excellent_max)
                 & valid_lra
             )
-            dynamics_scores.loc[ideal_mask] = 30
-
             low_acceptable_mask = (
-                (lra_values >= self.thresholds.lra_low_max)
-                & (lra_values < self.thresholds.lra_excellent_min)
+                (lra_values >= t.lra_low_max)
+                & (lra_values < t.lra_excellent_min)
                 & valid_lra
             )
-            dynamics_scores.loc[low_acceptable_mask] = self._map_to_score_vectorized(
-                lra_values.loc[low_acceptable_mask],
-                self.thresholds.lra_low_max,
-                self.thresholds.lra_excellent_min,
-                20,
-                28,
-            )
-
             high_mask = (
-                (lra_values > self.thresholds.lra_excellent_max)
-                & (lra_values <= self.thresholds.lra_acceptable_max)
+                (lra_values > t.lra_excellent_max)
+                & (lra_values <= t.lra_acceptable_max)
                 & valid_lra
             )
-            dynamics_scores.loc[high_mask] = self._map_to_score_vectorized(
-                lra_values.loc[high_mask],
-                self.thresholds.lra_excellent_max,
-                self.thresholds.lra_acceptable_max,
-                28,
-                22,
-            )
-
             low_mask = (
-                (lra_values >= self.thresholds.lra_poor_max)
-                & (lra_values < self.thresholds.lra_low_max)
+                (lra_values >= t.lra_poor_max)
+                & (lra_values < t.lra_low_max)
                 & valid_lra
             )
-            dynamics_scores.loc[low_mask] = self._map_to_score_vectorized(
-                lra_values.loc[low_mask],
-                self.thresholds.lra_poor_max,
-                self.thresholds.lra_low_max,
-                10,
-                20,
-            )
-
-            very_low_mask = (lra_values < self.thresholds.lra_poor_max) & valid_lra
-            dynamics_scores.loc[very_low_mask] = self._map_to_score_vectorized(
-                lra_values.loc[very_low_mask], 0, self.thresholds.lra_poor_max, 0, 10
+            very_low_mask = (lra_values < t.lra_poor_max) & valid_lra
+            too_high_mask = (lra_values > t.lra_acceptable_max) & valid_lra
+
+            dynamics_scores = np.select(
+                [
+                    ideal_mask,
+                    low_acceptable_mask,
+                    high_mask,
+                    low_mask,
+                    very_low_mask,
+                    too_high_mask,
+                ],
+                [
+                    30.0,
+                    _map_band(
+                        lra_values,
+                        t.lra_low_max,
+                        t.lra_excellent_min,
+                        20,
+                        28,
+                    ),
+                    _map_band(
+                        lra_values,
+                        t.lra_excellent_max,
+                        t.lra_acceptable_max,
+                        28,
+                        22,
+                    ),
+                    _map_band(
+                        lra_values,
+                        t.lra_poor_max,
+                        t.lra_low_max,
+                        10,
+                        20,
+                    ),
+                    _map_band(lra_values, 0, t.lra_poor_max, 0, 10),
+                    18.0,
+                ],
+                default=0.0,
             )
 
-            too_high_mask = (
-                lra_values > self.thresholds.lra_acceptable_max
-            ) & valid_lra
-            dynamics_scores.loc[too_high_mask] = 18
-
-        if "rmsDbAbove16k" in df.columns:
-            rms_16k = self._safe_fillna(df["rmsDbAbove16k"], -90)
-            spectrum_scores = self._map_to_score_vectorized(rms_16k, -90, -55, 0, 30)
+        if "rmsDbAbove16k" in cols:
+            rms_16k = inputs.filled["rmsDbAbove16k"]
+            spectrum_scores = _map_band(np.clip(rms_16k, -90, -55), -90, -55, 0, 30)
 
         total_scores = (
             integrity_scores + dynamics_scores + spectrum_scores - completeness_penalty
         )
 
-        if "状态" in df.columns:
-            fake_mask = df["状态"] == "可疑 (伪造)"
-            total_scores.loc[fake_mask] = np.minimum(total_scores.loc[fake_mask], 20)
+        fake_mask = status_codes == STATUS_FAKE
+        total_scores[fake_mask] = np.minimum(total_scores[fake_mask], 20)
 
-            incomplete_mask = df["状态"] == "数据不完整"
-            total_scores.loc[incomplete_mask] = np.minimum(
-                total_scores.loc[incomplete_mask], 40
-            )
+        incomplete_mask = status_codes == STATUS_INCOMPLETE
+        total_scores[incomplete_mask] = np.minimum(total_scores[incomplete_mask], 40)
 
-        return np.maximum(0, total_scores.round()).astype(int)
+        return pd.Series(
+            np.maximum(0, total_scores.round()).astype(int), index=df.index, copy=False
+        )
+
+    def _analyze_without_critical_fields(
+        self, df: pd.DataFrame, cols: FrozenSet[str]
+    ) -> None:
+        """
+        输入不含任何关键字段时的快速路径，直接写入 状态/备注/质量分 三列
+
+        状态与备注对所有行相同，无需逐项判定；质量分仍需计算，
+        因为 rmsDbAbove16k 的频谱得分可能高于缺失扣分。
+        """
+        n = len(df)
+        status_codes = np.full(n, STATUS_INCOMPLETE, dtype=np.int8)
+        df["状态"] = pd.Categorical.from_codes(status_codes, STATUS_CATEGORIES)
+        df["备注"] = np.full(n, BASE_NOTES[1], dtype=object)
+        df["质量分"] = self._calculate_quality_score_vectorized(
+            df, self._prepare_inputs(df, cols, None)
+        )
 
     def analyze_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """分析完整的DataFrame"""
@@ -516,21 +782,26 @@ class AudioQualityAnalyzer:
             desc="[ Python 端分析进度 ]",
             bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
         ) as pbar:
-            pbar.set_postfix_str("Step 1: 分析状态与备注...")
-            status_series, notes_series = self._analyze_row_vectorized(df)
-            df["状态"] = status_series
-            df["备注"] = notes_series
-            time.sleep(0.1)
-            pbar.update(1)
+            cols, peak_cfg = self._resolve_columns(df)
 
-            pbar.set_postfix_str("Step 2: 计算综合质量分...")
-            df["质量分"] = self._calculate_quality_score_vectorized(df)
-            time.sleep(0.1)
-            pbar.update(1)
+            if not cols & self.CRITICAL_FIELDS:
+                pbar.set_postfix_str("Step 1-2: 缺少关键字段，跳过逐项判定...")
+                self._analyze_without_critical_fields(df, cols)
+                pbar.update(2)
+            else:
+                pbar.set_postfix_str("Step 1: 分析状态与备注...")
+                inputs = self._prepare_inputs(df, cols, peak_cfg)
+                status_series, notes_series = self._analyze_row_vectorized(df, inputs)
+                df["状态"] = status_series
+                df["备注"] = notes_series
+                pbar.update(1)
+
+                pbar.set_postfix_str("Step 2: 计算综合质量分...")
+                df["质量分"] = self._calculate_quality_score_vectorized(df, inputs)
+                pbar.update(1)
 
             pbar.set_postfix_str("Step 3: 格式化与排序...")
             report_df = self.format_output_dataframe(df)
-            time.sleep(0.1)
             pbar.update(1)
 
             pbar.set_postfix_str("分析完成!")
@@ -545,11 +816,8 @@ class AudioQualityAnalyzer:
 
     def format_output_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """格式化输出DataFrame"""
-        peak_field = None
-        if "peakAmplitudeDb" in df.columns:
-            peak_field = "peakAmplitudeDb"
-        elif "peakAmplitude" in df.columns:
-            peak_field = "peakAmplitude"
+        cols = frozenset(df.columns)
+        peak_field = self._resolve_peak_field(cols)
 
         output_columns = ["质量分", "状态", "filePath", "备注", "lra"]
         if peak_field:
@@ -562,14 +830,136 @@ class AudioQualityAnalyzer:
             "overallRmsDb",
         ]
         for field in additional_fields:
-            if field in df.columns:
+            if field in cols:
                 output_columns.append(field)
 
-        final_columns = [col for col in output_columns if col in df.columns]
-        result_df = df[final_columns].copy()
-        result_df = result_df.sort_values(by="质量分", ascending=False)
+        final_columns = [col for col in output_columns if col in cols]
+        # CSV报告需要完整排序，摘要中的前5名直接取排序结果的前几行。
+        # 质量分为无缺失的整数列，对其相反数做稳定 argsort 即得到降序且同分保持原顺序的
+        # 行序，省去 sort_values 的多列与NaN处理；列选择已生成新对象，无需额外的 .copy()
+        order = np.argsort(-df["质量分"].to_numpy(), kind="stable")
+        return df[final_columns].take(order).reset_index(drop=True)
+
+
+# 判断输入格式时最多读取的文件前缀字节数；JSON Lines 的单条记录远小于此值
+JSON_SNIFF_BYTES = 64 * 1024
+
+
+def _is_json_lines(path: str) -> bool:
+    """
+    判断输入是否为 JSON Lines
+
+    扩展名为 .jsonl / .ndjson 时直接视为 JSON Lines。否则只读取文件开头的
+    JSON_SNIFF_BYTES 字节：不以 "{" 开头（如 "[" 开头的JSON数组）即不是 JSON Lines；
+    以 "{" 开头时，要求首行是一个完整的JSON对象且下一个非空行也以 "{" 开头。
+    单行的JSON对象（如 DataFrame.to_json() 的默认输出）不是 JSON Lines，
+    仍交给 pd.read_json 解析。
+    """
+    if Path(path).suffix.lower() in (".jsonl", ".ndjson"):
+        return True
+    with open(path, "rb") as f:
+        head = f.read(JSON_SNIFF_BYTES)
+    if not head.lstrip().startswith(b"{"):
+        return False
+    # 前缀末尾的行可能被截断；首行须在前缀内结束，才会有第二行参与判断
+    lines = [line for line in (raw.strip() for raw in head.split(b"\n")) if line]
+    if len(lines) < 2:
+        return False
+    first_line, second_line = lines[0], lines[1]
+    return first_line.endswith(b"}") and second_line.startswith(b"{")
+
+
+def _parquet_cache_path(path: str, cache_dir: str) -> Path:
+    """根据输入文件的绝对路径、修改时间和大小生成缓存文件路径"""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{digest}.parquet"
+
+
+def _parse_analysis_json(path: str) -> pd.DataFrame:
+    """解析JSON输入（JSON Lines 优先交给 Arrow，JSON 数组优先交给 orjson）"""
+    if _is_json_lines(path):
+        if HAS_PYARROW:
+            table = pa_json.read_json(path)
+            return table.to_pandas(self_destruct=True, split_blocks=True)
+        return pd.read_json(path, lines=True, precise_float=True)
+    if HAS_ORJSON:
+        with open(path, "rb") as f:
+            records = orjson.loads(f.read())
+        # 只有记录数组可直接构造；其他结构仍交给 pd.read_json 按其规则解析
+        if isinstance(records, list):
+            return pd.DataFrame.from_records(records)
+    return pd.read_json(path, precise_float=True)
+
+
+def load_analysis_json(path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    读取Rust生成的分析数据
+
+    JSON Lines 输入在安装了 pyarrow 时由 Arrow 直接解析为列式缓冲区，
+    避免逐条构造Python字典；JSON 数组（Rust端的默认输出）在安装了 orjson 时
+    由 orjson 解析后直接构造DataFrame，否则由 pd.read_json 解析。
+    pd.read_json 使用 precise_float，与 Arrow/orjson 一样按正确舍入解析浮点数，
+    报告（如 LRA 备注的一位小数）不随已安装的可选依赖而变化。
+    指定 cache_dir 时，解析结果以 Parquet 缓存，输入文件未变化的后续运行直接读取缓存。
+    """
+    cache_path = None
+    if cache_dir:
+        if HAS_PYARROW:
+            cache_path = _parquet_cache_path(path, cache_dir)
+        else:
+            logger.warning("未安装 pyarrow，已忽略缓存目录设置")
+
+    if cache_path is not None and cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"缓存文件无法读取，将重新解析JSON: {e}")
+
+    df = _parse_analysis_json(path)
 
-        return result_df
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免并发运行读到不完整的缓存
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp_path, compression="zstd", index=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"无法写入缓存文件 {cache_path}: {e}")
+
+    return df
+
+
+def write_report_csv(report_df: pd.DataFrame, path: str) -> None:
+    """
+    写出带 UTF-8 BOM 的CSV报告
+
+    安装了 pyarrow 时由 Arrow 的C++写出器按列批量写出；否则使用 DataFrame.to_csv。
+    """
+    if HAS_PYARROW:
+        try:
+            table = pa.Table.from_pandas(report_df, preserve_index=False)
+            # 分类列（如 "状态"）在Arrow中为字典类型，CSV写出器需要普通字符串
+            schema = pa.schema(
+                [
+                    (
+                        pa.field(field.name, pa.string())
+                        if pa.types.is_dictionary(field.type)
+                        else field
+                    )
+                    for field in table.schema
+                ]
+            )
+            with open(path, "wb") as f:
+                f.write(b"\xef\xbb\xbf")
+                pa_csv.write_csv(table.cast(schema), f)
+            return
+        except pa.ArrowException as e:
+            logger.warning(f"Arrow CSV写出失败，改用pandas: {e}")
+
+    report_df.to_csv(path, index=False, encoding="utf-8-sig")
 
 
 def main():
@@ -578,7 +968,10 @@ def main():
         description="分析由 audio_analyzer (Rust) 生成的 JSON 数据 (v4.1 PyInstaller兼容版)。"
     )
 
-    parser.add_argument("input_json", help="输入的 analysis_data.json 文件路径。")
+    parser.add_argument(
+        "input_json",
+        help="输入的 analysis_data.json 文件路径（JSON 数组或 JSON Lines）。",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -592,6 +985,11 @@ def main():
         "--show-incomplete", action="store_true", help="显示数据不完整的文件详情。"
     )
     parser.add_argument("--show-stats", action="store_true", help="显示详细统计信息。")
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="将解析后的数据缓存为 Parquet 的目录；输入未变化时重复运行可跳过JSON解析 (需要 pyarrow)。",
+    )
 
     args = parser.parse_args()
 
@@ -600,7 +998,7 @@ def main():
         return 1
 
     try:
-        df = pd.read_json(args.input_json)
+        df = load_analysis_json(args.input_json, args.cache_dir)
     except Exception as e:
         print(f"错误: 无法解析JSON文件: {e}", file=sys.stderr)
         return 1
@@ -620,7 +1018,7 @@ def main():
             if filtered_count > 0:
                 print(f"已过滤掉 {filtered_count} 个低分文件 (< {args.min_score}分)")
 
-        report_df.to_csv(args.output, index=False, encoding="utf-8-sig")
+        write_report_csv(report_df, args.output)
         print(f"\n✅ 完整的分析报告已保存到: {args.output}")
         if len(report_df) < len(df):
             filtered_count = len(df) - len(report_df)
@@ -628,17 +1026,23 @@ def main():
 
         print(f"\n--- 优化分析摘要 (v4.1) ---")
         status_counts = report_df["状态"].value_counts()
+        # 分类列的 value_counts 会包含计数为0的类别
+        status_counts = status_counts[status_counts > 0]
         print(f"\n📊 质量状态分布:")
         for status, count in status_counts.items():
             percentage = (count / len(df)) * 100
             print(f" - {status}: {count} 个文件 ({percentage:.1f}%)")
 
         print(f"\n🏆 质量排名前 5 的文件:")
-        for i, (_, row) in enumerate(report_df.head(5).iterrows(), 1):
-            filename = (
-                os.path.basename(row["filePath"]) if "filePath" in row else "Unknown"
-            )
-            print(f" {i}. [分数: {int(row['质量分'])}] {filename}")
+        top_df = report_df.head(5)
+        if "filePath" in top_df.columns:
+            filenames = [os.path.basename(path) for path in top_df["filePath"]]
+        else:
+            filenames = ["Unknown"] * len(top_df)
+        for i, (score, filename) in enumerate(
+            zip(top_df["质量分"].to_numpy(), filenames), 1
+        ):
+            print(f" {i}. [分数: {int(score)}] {filename}")
 
         return 0
 